@@ -1,3 +1,16 @@
-from .core import RemoveSpikes
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import RemoveSpikes
 
 __all__ = ["RemoveSpikes"]
+
+
+def __getattr__(name: str):
+    # Import the core lazily, since it pulls in geopandas, which is slow to
+    # import. This keeps the CLI responsive for --help and argument errors.
+    if name == "RemoveSpikes":
+        from .core import RemoveSpikes
+
+        return RemoveSpikes
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,87 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+def spike_mask(
+    coords: np.ndarray,
+    offsets: np.ndarray,
+    cos_threshold: float,
+    min_distance_sq: float,
+    closed: bool,
+) -> np.ndarray:
+    """
+    Scalar equivalent of RemoveSpikes._spike_mask, compiled with Numba.
+
+    Scans the vertices once, without allocating the temporary arrays needed
+    by the NumPy version.
+    """
+    keep = np.ones(coords.shape[0], dtype=np.bool_)
+
+    cos_threshold_sq = cos_threshold * cos_threshold
+    acute_threshold = cos_threshold >= 0
+
+    for part in range(offsets.shape[0] - 1):
+        first = offsets[part]
+        last = offsets[part + 1] - 1
+
+        if closed:
+            # The last vertex repeats the first one, so it's the neighbor of
+            # the second to last vertex, and it's always dropped
+            start = first
+            prev = last - 1
+            keep[last] = False
+        else:
+            start = first + 1
+            prev = first
+
+        ba_x = coords[prev, 0] - coords[start, 0]
+        ba_y = coords[prev, 1] - coords[start, 1]
+        ba_sq = ba_x * ba_x + ba_y * ba_y
+
+        for i in range(start, last):
+            bc_x = coords[i + 1, 0] - coords[i, 0]
+            bc_y = coords[i + 1, 1] - coords[i, 1]
+            bc_sq = bc_x * bc_x + bc_y * bc_y
+
+            dot_product = ba_x * bc_x + ba_y * bc_y
+            dot_product_sq = dot_product * dot_product
+            threshold_sq = cos_threshold_sq * ba_sq * bc_sq
+
+            # Bitwise operators instead of and/or, so there are no data
+            # dependent branches
+            if acute_threshold:
+                below_threshold = (dot_product > 0) & (
+                    dot_product_sq > threshold_sq
+                )
+            else:
+                below_threshold = (dot_product >= 0) | (
+                    dot_product_sq < threshold_sq
+                )
+            keep[i] = not (
+                below_threshold
+                & (ba_sq > min_distance_sq)
+                & (bc_sq > min_distance_sq)
+            )
+
+            # The edge to the next vertex is the edge to the previous one of
+            # the next iteration, reversed (negation is exact)
+            ba_x = -bc_x
+            ba_y = -bc_y
+            ba_sq = bc_sq
+
+    return keep
+
+
+if njit is not None:
+    # Compiled lazily on the first call. It isn't cached on disk, since
+    # Numba's cache is keyed by module name and this file is imported both
+    # as removespikes and as src.removespikes (by the tests), which breaks
+    # loading it. fastmath is not used, since it assumes there are no
+    # infinite thresholds or NaN products.
+    spike_mask = njit(nogil=True)(spike_mask)
+else:  # pragma: no cover
+    spike_mask = None
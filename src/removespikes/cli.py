@@ -1,9 +1,5 @@
 import argparse
 
-import geopandas as gpd
-
-from . import RemoveSpikes
-
 
 def main() -> None:
     """
@@ -60,15 +56,30 @@ def main() -> None:
         help="Minimum distance in units between a vertex and its neighbors "
         "for it to be considered a spike. Defaults to 0.0 units.",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=-1,
+        help="Number of threads used to process the geometries. Defaults to "
+        "-1, which uses all available CPUs.",
+    )
 
     args = parser.parse_args()
 
+    # Imported only after parsing the arguments, since geopandas is slow to
+    # import
+    import geopandas as gpd
+
+    from . import RemoveSpikes
+
     try:
         if args.layer:
             gdf: gpd.GeoDataFrame = RemoveSpikes.from_file(
                 args.input,
                 angle=args.angle,
                 min_distance=args.min_distance,
+                n_jobs=args.jobs,
                 geometry_column=args.geometry_column,
                 layer=args.layer,
             )
@@ -77,9 +88,10 @@ def main() -> None:
                 args.input,
                 angle=args.angle,
                 min_distance=args.min_distance,
+                n_jobs=args.jobs,
                 geometry_column=args.geometry_column,
             )
-        gdf.to_file(args.output)
+        gdf.to_file(args.output, engine="pyogrio")
         print(f"Spikes removed successfully. Output saved to: {args.output}")
     except Exception as e:
         print(f"Error processing data: {e}")
@@ -1,8 +1,26 @@
+import importlib.util
+import itertools
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import geopandas as gpd
 import numpy as np
-from shapely.geometry import LineString, Polygon
-
-GeometryType = LineString | Polygon
+import pandas as pd
+import shapely
+from shapely.geometry import (
+    GeometryCollection,
+    LineString,
+    MultiLineString,
+    MultiPolygon,
+    Polygon,
+)
+
+from . import _kernels
+
+GeometryType = (
+    LineString | Polygon | MultiLineString | MultiPolygon | GeometryCollection
+)
 Coord = tuple[float, float]
 
 
@@ -11,22 +29,19 @@ class RemoveSpikes:
     def _calculate_angle(a: Coord, b: Coord, c: Coord) -> float:
         """Calculate the angle between three points (in degrees)."""
 
-        # Convert points to numpy arrays
-        A = np.array(a)
-        B = np.array(b)
-        C = np.array(c)
-
         # Create vectors BA and BC
-        BA = A - B
-        BC = C - B
-
-        # Calculate the dot product and magnitudes of BA and BC
-        dot_product = np.dot(BA, BC)
-        magnitude_BA = np.linalg.norm(BA)
-        magnitude_BC = np.linalg.norm(BC)
+        ba_x = a[0] - b[0]
+        ba_y = a[1] - b[1]
+        bc_x = c[0] - b[0]
+        bc_y = c[1] - b[1]
+
+        # Calculate the dot product and magnitudes product of BA and BC
+        dot_product = ba_x * bc_x + ba_y * bc_y
+        mag_product = math.sqrt(
+            (ba_x * ba_x + ba_y * ba_y) * (bc_x * bc_x + bc_y * bc_y)
+        )
 
         # Raise error if the magnitudes product is zero
-        mag_product = magnitude_BA * magnitude_BC
         if mag_product == 0:
             raise ZeroDivisionError()
 
@@ -34,15 +49,27 @@ class RemoveSpikes:
         cos_angle = dot_product / mag_product
 
         # Clip cos_angle to avoid numerical issues outside the range [-1, 1]
-        cos_angle = np.clip(cos_angle, -1.0, 1.0)
+        cos_angle = min(max(cos_angle, -1.0), 1.0)
 
-        # Calculate the angle in radians
-        angle_rad = np.arccos(cos_angle)
+        # Calculate the angle and convert it to degrees
+        return math.degrees(math.acos(cos_angle))
 
-        # Convert the angle to degrees
-        angle_deg = np.degrees(angle_rad)
+    @staticmethod
+    def _cos_threshold(angle_threshold: float) -> float:
+        """
+        Convert an angle threshold (in degrees) to a cosine threshold.
 
-        return float(angle_deg)
+        An angle is smaller than angle_threshold if and only if its cosine is
+        greater than the returned value, so the angle itself never needs to be
+        computed.
+        """
+        if angle_threshold <= 0:
+            # No angle is smaller than zero
+            return math.inf
+        if angle_threshold > 180:
+            # Every angle is smaller than the threshold
+            return -math.inf
+        return math.cos(math.radians(angle_threshold))
 
     @staticmethod
     def _is_spike(
@@ -55,19 +82,143 @@ class RemoveSpikes:
         """
         Check if a point is a spike based on angle and distance thresholds.
         """
-        try:
-            angle: float = RemoveSpikes._calculate_angle(a, b, c)
-        except ZeroDivisionError:
-            # Don't consider as spike if angle calculation fails
+        return RemoveSpikes._is_spike_cos(
+            a,
+            b,
+            c,
+            RemoveSpikes._cos_threshold(angle_threshold),
+            max(min_distance, 0.0) ** 2,
+        )
+
+    @staticmethod
+    def _is_spike_cos(
+        a: Coord,
+        b: Coord,
+        c: Coord,
+        cos_threshold: float,
+        min_distance_sq: float,
+    ) -> bool:
+        """
+        Check if a point is a spike based on precomputed thresholds.
+
+        Args:
+            a: The previous point.
+            b: The point being checked.
+            c: The next point.
+            cos_threshold: Cosine of the angle threshold, as returned by
+                _cos_threshold.
+            min_distance_sq: Squared minimum distance, must not be negative.
+
+        Returns:
+            True if the point is a spike.
+        """
+        ba_x = a[0] - b[0]
+        ba_y = a[1] - b[1]
+        bc_x = c[0] - b[0]
+        bc_y = c[1] - b[1]
+
+        ba_sq = ba_x * ba_x + ba_y * ba_y
+        bc_sq = bc_x * bc_x + bc_y * bc_y
+
+        # Also rules out duplicate points, for which the angle is undefined
+        if ba_sq <= min_distance_sq or bc_sq <= min_distance_sq:
             return False
 
-        d1: float = ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
-        d2: float = ((b[0] - c[0]) ** 2 + (b[1] - c[1]) ** 2) ** 0.5
+        # The cosine is dot_product / sqrt(ba_sq * bc_sq). Compare squared
+        # values instead, taking the signs into account, to avoid the sqrt.
+        dot_product = ba_x * bc_x + ba_y * bc_y
+        dot_product_sq = dot_product * dot_product
+        threshold_sq = cos_threshold * cos_threshold * ba_sq * bc_sq
+
+        if cos_threshold >= 0:
+            return dot_product > 0 and dot_product_sq > threshold_sq
+        return dot_product >= 0 or dot_product_sq < threshold_sq
+
+    @staticmethod
+    def _spike_mask(
+        coords: np.ndarray,
+        cos_threshold: float,
+        min_distance_sq: float,
+        closed: bool,
+        offsets: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Find the vertices of lines or rings that are not spikes.
+
+        Args:
+            coords: An (N, 2) array with the vertices of one or more lines or
+                rings, one after the other. Each closed ring must end with a
+                repetition of its first vertex.
+            cos_threshold: Cosine of the angle threshold, as returned by
+                _cos_threshold.
+            min_distance_sq: Squared minimum distance, must not be negative.
+            closed: Whether the vertices form closed rings. In this case, the
+                repeated last vertex of each ring is never kept, since linear
+                rings are closed again when built. Otherwise, the first and
+                last vertices of each line are always kept.
+            offsets: Index of the first vertex of each line or ring, followed
+                by N. Defaults to a single line or ring with all the vertices.
+
+        Returns:
+            A boolean array of length N, True for the vertices to keep.
+        """
+        n = len(coords)
+        if offsets is None:
+            offsets = np.array([0, n], dtype=np.int64)
+
+        if _kernels.spike_mask is not None:
+            return _kernels.spike_mask(
+                coords, offsets, cos_threshold, min_distance_sq, closed
+            )
+
+        firsts = offsets[:-1]
+        lasts = offsets[1:] - 1
+
+        # Neighbors of each vertex. The first vertex of a ring is preceded by
+        # the second to last one, since the last one repeats it. The first
+        # and last vertices of a line are always kept, so their neighbors
+        # don't matter.
+        prev_idx = np.arange(-1, n - 1)
+        prev_idx[firsts] = lasts - 1 if closed else firsts
+        next_idx = np.arange(1, n + 1)
+        next_idx[lasts] = lasts
+
+        ba = coords[prev_idx] - coords
+        bc = coords[next_idx] - coords
+
+        ba_sq = (ba * ba).sum(axis=1)
+        bc_sq = (bc * bc).sum(axis=1)
+        dot_product = (ba * bc).sum(axis=1)
+
+        # Same squared comparison as in _is_spike_cos. With an infinite
+        # threshold, duplicate points give NaN, which fails every comparison.
+        dot_product_sq = dot_product * dot_product
+        with np.errstate(invalid="ignore"):
+            threshold_sq = cos_threshold * cos_threshold * ba_sq * bc_sq
+
+        if cos_threshold >= 0:
+            below_threshold = (dot_product > 0) & (
+                dot_product_sq > threshold_sq
+            )
+        else:
+            below_threshold = (dot_product >= 0) | (
+                dot_product_sq < threshold_sq
+            )
 
-        return (
-            angle < angle_threshold and d1 > min_distance and d2 > min_distance
+        keep = ~(
+            below_threshold
+            & (ba_sq > min_distance_sq)
+            & (bc_sq > min_distance_sq)
         )
 
+        if closed:
+            keep[lasts] = False
+        else:
+            keep[firsts] = True
+            keep[lasts] = True
+
+        return keep
+
     @staticmethod
     def _remove_spikes_from_geometry(
         geometry: GeometryType,
@@ -75,10 +226,13 @@ class RemoveSpikes:
         min_distance: float = 0.0,
     ) -> GeometryType:
         """
-        Remove spikes from a single LineString or Polygon geometry.
+        Remove spikes from a single geometry.
 
         Args:
-            geometry: The LineString or Polygon to remove spikes from.
+            geometry: The geometry to remove spikes from. LineStrings,
+                Polygons (including their holes), their Multi variants and
+                GeometryCollections are supported. Other geometries are
+                returned unchanged.
             angle_threshold: Angle threshold in degrees. Vertices with an
                 angle smaller than this threshold will be considered spikes.
             min_distance:  Minimum distance between a vertex and its neighbors
@@ -87,57 +241,318 @@ class RemoveSpikes:
         Returns:
             The geometry with spikes removed.
         """
-        if geometry.is_empty:
-            return geometry
+        geometries = np.empty(1, dtype=object)
+        geometries[0] = geometry
+        return RemoveSpikes._remove_spikes_from_array(
+            geometries, angle_threshold, min_distance
+        )[0]
+
+    @staticmethod
+    def _remove_spikes_from_array(
+        geometries: np.ndarray,
+        angle_threshold: float = 1.0,
+        min_distance: float = 0.0,
+    ) -> np.ndarray:
+        """
+        Remove spikes from an array of geometries.
+
+        Multi geometries and polygons are split into their lines and rings,
+        whose spikes are all removed at once. The new geometries are then put
+        back together with Shapely's vectorized constructors, instead of one
+        call per geometry.
+
+        Args:
+            geometries: An array of Shapely geometries. LineStrings,
+                LinearRings, Polygons (including their holes), their Multi
+                variants and GeometryCollections are supported. Other
+                geometries are returned unchanged.
+            angle_threshold: Angle threshold in degrees. Vertices with an
+                angle smaller than this threshold will be considered spikes.
+            min_distance:  Minimum distance between a vertex and its neighbors
+                for it to be considered a spike.
+
+        Returns:
+            A new array with the geometries with spikes removed.
+        """
+        result = np.array(geometries, dtype=object)
 
-        def is_line() -> bool:
-            return isinstance(geometry, LineString)
+        cos_threshold = RemoveSpikes._cos_threshold(angle_threshold)
+        min_distance_sq = max(min_distance, 0.0) ** 2
 
-        def is_polygon() -> bool:
-            return isinstance(geometry, Polygon)
+        if cos_threshold == math.inf:
+            # No vertex can have an angle smaller than the threshold
+            return result
 
-        if not is_line() and not is_polygon:
-            return geometry
+        type_ids = shapely.get_type_id(geometries)
+        if (
+            (type_ids < shapely.GeometryType.LINESTRING)
+            | (type_ids == shapely.GeometryType.MULTIPOINT)
+        ).all():
+            # Layers of points (or missing geometries) have no spikes
+            return result
 
-        coords = (
-            list(geometry.coords)
-            if is_line()
-            else list(geometry.exterior.coords)
+        is_empty = shapely.is_empty(geometries)
+        has_z = shapely.has_z(geometries)
+
+        rows = np.flatnonzero(
+            (type_ids == shapely.GeometryType.GEOMETRYCOLLECTION) & ~is_empty
         )
-        new_coords: list[Coord] = [coords[0]]
-
-        if isinstance(geometry, Polygon):
-            # Handle the case where the first point is a spike in a Polygon
-            if RemoveSpikes._is_spike(
-                coords[-2], coords[0], coords[1], angle_threshold, min_distance
-            ):
-                # Start from the second point
-                new_coords = []
-
-        for i in range(1, len(coords) - 1):
-            prev_pt = coords[i - 1]
-            curr_pt = coords[i]
-            next_pt = coords[i + 1]
-
-            if not RemoveSpikes._is_spike(
-                prev_pt, curr_pt, next_pt, angle_threshold, min_distance
-            ):
-                new_coords.append(curr_pt)
-
-        # Don't add the last point to the new polygon. The first and last
-        # coordinates of a polygon are the same. If we remove the first point,
-        # we can't add it back as the last one. The simplest solution is to not
-        # append it, since creating a Polygon(a, b, c) is the same as creating
-        # a Polygon(a, b, c, a).
-        if is_line():
-            new_coords.append(coords[-1])
-
-        if isinstance(geometry, LineString):
-            return LineString(new_coords)
-        elif isinstance(geometry, Polygon):
-            return Polygon(new_coords)
+        if len(rows):
+            parts, index = shapely.get_parts(
+                geometries[rows], return_index=True
+            )
+            result[rows] = shapely.geometrycollections(
+                RemoveSpikes._remove_spikes_from_array(
+                    parts, angle_threshold, min_distance
+                ),
+                indices=index,
+            )
+
+        # LinearRings are handled like the rings of polygons
+        for include_z in (False, True):
+            rows = np.flatnonzero(
+                (type_ids == shapely.GeometryType.LINEARRING)
+                & ~is_empty
+                & (has_z == include_z)
+            )
+            if not len(rows):
+                continue
+
+            new_rings, ring_changed = RemoveSpikes._remove_spikes_from_lines(
+                geometries[rows],
+                True,
+                include_z,
+                cos_threshold,
+                min_distance_sq,
+            )
+            result[rows[ring_changed]] = new_rings[ring_changed]
+
+        # 2D and 3D coordinates can't be extracted and built together
+        for (single_type, multi_type), include_z in itertools.product(
+            (
+                (
+                    shapely.GeometryType.LINESTRING,
+                    shapely.GeometryType.MULTILINESTRING,
+                ),
+                (
+                    shapely.GeometryType.POLYGON,
+                    shapely.GeometryType.MULTIPOLYGON,
+                ),
+            ),
+            (False, True),
+        ):
+            rows = np.flatnonzero(
+                ((type_ids == single_type) | (type_ids == multi_type))
+                & ~is_empty
+                & (has_z == include_z)
+            )
+            if not len(rows):
+                continue
+
+            closed = single_type == shapely.GeometryType.POLYGON
+            parts, part_index = shapely.get_parts(
+                geometries[rows], return_index=True
+            )
+
+            if closed:
+                rings, ring_index = shapely.get_rings(parts, return_index=True)
+                new_rings, ring_changed = (
+                    RemoveSpikes._remove_spikes_from_lines(
+                        rings,
+                        closed,
+                        include_z,
+                        cos_threshold,
+                        min_distance_sq,
+                    )
+                )
+                part_changed = RemoveSpikes._any_in_group(
+                    ring_changed, ring_index, len(parts)
+                )
+                # The first ring of each polygon is its exterior
+                changed_rings, changed_ring_index = (
+                    RemoveSpikes._select_groups(
+                        new_rings, ring_index, part_changed
+                    )
+                )
+                new_parts = parts.copy()
+                new_parts[part_changed] = shapely.polygons(
+                    changed_rings, indices=changed_ring_index
+                )
+            else:
+                new_parts, part_changed = (
+                    RemoveSpikes._remove_spikes_from_lines(
+                        parts,
+                        closed,
+                        include_z,
+                        cos_threshold,
+                        min_distance_sq,
+                    )
+                )
+
+            # Only geometries with a changed part need to be built again
+            row_changed = RemoveSpikes._any_in_group(
+                part_changed, part_index, len(rows)
+            )
+            is_multi = type_ids[rows] == multi_type
+
+            # Single geometries have exactly one part, so it can be used as is
+            result[rows[~is_multi & row_changed]] = new_parts[
+                ~is_multi[part_index] & part_changed
+            ]
+
+            is_rebuilt = is_multi & row_changed
+            if is_rebuilt.any():
+                multi_constructor = (
+                    shapely.multipolygons
+                    if closed
+                    else shapely.multilinestrings
+                )
+                rebuilt_parts, rebuilt_part_index = (
+                    RemoveSpikes._select_groups(
+                        new_parts, part_index, is_rebuilt
+                    )
+                )
+                result[rows[is_rebuilt]] = multi_constructor(
+                    rebuilt_parts, indices=rebuilt_part_index
+                )
+
+        return result
+
+    @staticmethod
+    def _any_in_group(
+        values: np.ndarray, index: np.ndarray, n_groups: int
+    ) -> np.ndarray:
+        """
+        Check, for each group, whether any of its values is True.
+
+        Args:
+            values: A boolean array.
+            index: The group of each value, between 0 and n_groups - 1.
+            n_groups: The number of groups.
+
+        Returns:
+            A boolean array of length n_groups.
+        """
+        return np.bincount(index[values], minlength=n_groups) > 0
+
+    @staticmethod
+    def _select_groups(
+        geometries: np.ndarray, index: np.ndarray, selected: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Select the geometries of some groups, to be passed to the vectorized
+        constructors of Shapely.
+
+        Args:
+            geometries: An array of geometries.
+            index: The group of each geometry.
+            selected: A boolean array with one value per group.
+
+        Returns:
+            The geometries of the selected groups, and their group index
+            renumbered to count only the selected groups.
+        """
+        is_selected = selected[index]
+        new_index = np.cumsum(selected) - 1
+        return geometries[is_selected], new_index[index[is_selected]]
+
+    @staticmethod
+    def _remove_spikes_from_lines(
+        lines: np.ndarray,
+        closed: bool,
+        include_z: bool,
+        cos_threshold: float,
+        min_distance_sq: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Remove spikes from an array of LineStrings or LinearRings.
+
+        Args:
+            lines: An array of LineStrings, or of LinearRings if closed. All of
+                them must have Z coordinates if include_z, or none of them.
+            closed: Whether lines are LinearRings.
+            include_z: Whether to keep the Z coordinates.
+            cos_threshold: Cosine of the angle threshold, as returned by
+                _cos_threshold.
+            min_distance_sq: Squared minimum distance, must not be negative.
+
+        Returns:
+            A new array with the lines with spikes removed, and a boolean array
+            that is True for the lines that had spikes. The other lines are
+            returned as is.
+        """
+        result = lines.copy()
+        changed = np.zeros(len(lines), dtype=bool)
+        counts = shapely.get_num_coordinates(lines)
+
+        # Lines need at least 3 vertices to have a spike. Rings need at least
+        # 4 distinct ones, since removing a vertex from a triangle leaves an
+        # invalid ring.
+        is_candidate = counts > (4 if closed else 2)
+
+        if min_distance_sq > 0:
+            # No edge is longer than the diagonal of the bounding box, so lines
+            # with a diagonal up to min_distance can't have spikes
+            bounds = shapely.bounds(lines)
+            width = bounds[:, 2] - bounds[:, 0]
+            height = bounds[:, 3] - bounds[:, 1]
+            is_candidate &= width * width + height * height > min_distance_sq
+
+        selected = np.flatnonzero(is_candidate)
+        if not len(selected):
+            return result, changed
+        lines = lines[selected]
+        counts = counts[selected]
+
+        # Coordinates of all the lines in one array, with the index of the
+        # line each coordinate comes from
+        coords, index = shapely.get_coordinates(
+            lines, include_z=include_z, return_index=True
+        )
+
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        keep = RemoveSpikes._spike_mask(
+            coords[:, :2], cos_threshold, min_distance_sq, closed, offsets
+        )
+        kept_counts = np.add.reduceat(keep, offsets[:-1], dtype=np.intp)
+
+        if closed:
+            # Leave rings that would end up with less than 3 vertices
+            # unchanged, instead of building invalid rings. The last vertex
+            # is never kept, since it repeats the first one.
+            is_changed = (kept_counts < counts - 1) & (kept_counts >= 3)
         else:
-            return geometry
+            is_changed = kept_counts < counts
+
+        if not is_changed.any():
+            return result, changed
+
+        # Only lines that lost vertices need to be built again
+        keep &= np.repeat(is_changed, counts)
+
+        # compress is much faster than boolean indexing for 2D arrays
+        coords = coords.compress(keep, axis=0)
+        index = index.compress(keep)
+
+        constructor = shapely.linearrings if closed else shapely.linestrings
+        new_index = np.cumsum(is_changed) - 1
+        result[selected[is_changed]] = constructor(
+            coords, indices=new_index[index]
+        )
+        changed[selected[is_changed]] = True
+        return result, changed
+
+    @staticmethod
+    def _has_pyarrow() -> bool:
+        """
+        Check whether pyarrow is installed, without importing it.
+
+        Returns:
+            True if pyarrow can be imported.
+        """
+        return importlib.util.find_spec("pyarrow") is not None
 
     @staticmethod
     def from_file(
@@ -145,6 +560,7 @@ class RemoveSpikes:
         geometry_column: str | None = None,
         angle: float = 1,
         min_distance: float = 0.0,
+        n_jobs: int = 1,
         **kwargs,
     ) -> gpd.GeoDataFrame:
         """
@@ -157,16 +573,25 @@ class RemoveSpikes:
                 than this threshold will be considered spikes. Defaults to 1.0.
             min_distance: Minimum distance between a vertex and its neighbors
                 for it to be considered a spike. Defaults to 0.0.
-            **kwargs: These arguments are passed to fiona.open, and can be used
-                to access multi-layer data, data stored within archives (zip
-                files), etc.
+            n_jobs: Number of threads used to process the geometries. If -1,
+                all available CPUs are used. Defaults to 1.
+            **kwargs: These arguments are passed to gpd.read_file, and can be
+                used to access multi-layer data, data stored within archives
+                (zip files), etc. The pyogrio engine is used unless another
+                engine is given, reading through Arrow if pyarrow is
+                installed.
 
         Returns:
             A GeoDataFrame with the modified geometries.
         """
+        kwargs.setdefault("engine", "pyogrio")
+        if kwargs["engine"] == "pyogrio":
+            # Reading through Arrow avoids building the geometries one by one
+            kwargs.setdefault("use_arrow", RemoveSpikes._has_pyarrow())
         gdf: gpd.GeoDataFrame = gpd.read_file(filename, **kwargs)
+        # The GeoDataFrame was just read, so there is no need to copy it
         return RemoveSpikes.from_geodataframe(
-            gdf, geometry_column, angle, min_distance
+            gdf, geometry_column, angle, min_distance, n_jobs, copy=False
         )
 
     @staticmethod
@@ -175,6 +600,8 @@ class RemoveSpikes:
         geometry_column: str | None = None,
         angle: float = 1,
         min_distance: float = 0.0,
+        n_jobs: int = 1,
+        copy: bool = True,
     ) -> gpd.GeoDataFrame:
         """
         Remove spikes from LineStrings or Polygons in a GeoDataFrame.
@@ -187,15 +614,50 @@ class RemoveSpikes:
                 than this threshold will be considered spikes. Defaults to 1.0.
             min_distance: Minimum distance between a vertex and its neighbors
                 for it to be considered a spike. Defaults to 0.0.
+            n_jobs: Number of threads used to process the geometries. If -1,
+                all available CPUs are used. Defaults to 1.
+            copy: Whether to copy the data of the other columns. If False, the
+                new GeoDataFrame shares it with gdf, which avoids copying
+                large frames. Defaults to True.
 
         Returns:
             A new GeoDataFrame with the modified geometries.
         """
-        gdf = gdf.copy()  # type: ignore
         geometry_column = geometry_column or gdf.geometry.name
-        gdf[geometry_column] = gdf[geometry_column].apply(
-            lambda geom: RemoveSpikes._remove_spikes_from_geometry(
-                geom, angle, min_distance
+
+        if RemoveSpikes._cos_threshold(angle) == math.inf:
+            # No vertex can have an angle smaller than the threshold
+            return gdf.copy(deep=copy)  # type: ignore
+
+        def remove_spikes(geometries: pd.Series) -> pd.Series:
+            new_geometries = RemoveSpikes._remove_spikes_from_array(
+                np.asarray(geometries.values), angle, min_distance
             )
-        )
+            if isinstance(geometries, gpd.GeoSeries):
+                return gpd.GeoSeries(
+                    new_geometries, index=geometries.index, crs=geometries.crs
+                )
+            return pd.Series(new_geometries, index=geometries.index)
+
+        geometries = gdf[geometry_column]
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(geometries))
+
+        if n_jobs <= 1:
+            new_geometries = remove_spikes(geometries)
+        else:
+            # The geometries are independent, so each thread takes a
+            # contiguous chunk. The Numba kernel releases the GIL while it
+            # runs.
+            chunk_size = -(-len(geometries) // n_jobs)
+            chunks = [
+                geometries.iloc[i : i + chunk_size]
+                for i in range(0, len(geometries), chunk_size)
+            ]
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                new_geometries = pd.concat(executor.map(remove_spikes, chunks))
+
+        gdf = gdf.copy(deep=copy)  # type: ignore
+        gdf[geometry_column] = new_geometries
         return gdf
@@ -17,6 +17,7 @@ class TestRemoveSpikesMain:
             output="output_file.gpkg",
             angle=1.0,
             min_distance=0.0,
+            jobs=-1,
         )
 
         # Setup mock return values
@@ -32,10 +33,13 @@ class TestRemoveSpikesMain:
             "input_file.gpkg",
             angle=1.0,
             min_distance=0.0,
+            n_jobs=-1,
             geometry_column="geometry",
             layer="layer_name",
         )
-        mock_gdf.to_file.assert_called_once_with("output_file.gpkg")
+        mock_gdf.to_file.assert_called_once_with(
+            "output_file.gpkg", engine="pyogrio"
+        )
         mock_print.assert_called_with(
             "Spikes removed successfully. Output saved to: output_file.gpkg"
         )
@@ -51,6 +55,7 @@ class TestRemoveSpikesMain:
             output="output_file.gpkg",
             angle=1.0,
             min_distance=0.0,
+            jobs=-1,
         )
 
         # Setup mock return values
@@ -66,9 +71,12 @@ class TestRemoveSpikesMain:
             "input_file.gpkg",
             angle=1.0,
             min_distance=0.0,
+            n_jobs=-1,
             geometry_column="geometry",
         )
-        mock_gdf.to_file.assert_called_once_with("output_file.gpkg")
+        mock_gdf.to_file.assert_called_once_with(
+            "output_file.gpkg", engine="pyogrio"
+        )
         mock_print.assert_called_with(
             "Spikes removed successfully. Output saved to: output_file.gpkg"
         )
@@ -84,6 +92,7 @@ class TestRemoveSpikesMain:
             output="output_file.gpkg",
             angle=1.0,
             min_distance=0.0,
+            jobs=-1,
         )
 
         # Setup mock exception
@@ -98,6 +107,7 @@ class TestRemoveSpikesMain:
             "input_file.gpkg",
             angle=1.0,
             min_distance=0.0,
+            n_jobs=-1,
             geometry_column="geometry",
             layer="layer_name",
         )
@@ -1,13 +1,27 @@
+import os
+import subprocess
+import sys
 from math import isclose
+from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
-import fiona
-import fiona.errors
 import geopandas as gpd
+import numpy as np
+import pyogrio.errors
 import pytest
-from shapely.geometry import LineString, Polygon
+from shapely.geometry import (
+    GeometryCollection,
+    LinearRing,
+    LineString,
+    MultiLineString,
+    MultiPoint,
+    MultiPolygon,
+    Point,
+    Polygon,
+)
 
-from src.removespikes import RemoveSpikes
+from src.removespikes import RemoveSpikes, _kernels
 
 
 class TestCalculateAngle:
@@ -46,6 +60,28 @@ class TestCalculateAngle:
             RemoveSpikes._calculate_angle(a, b, c)
 
 
+class TestCosThreshold:
+    @pytest.mark.parametrize(
+        "a, b, c",
+        [
+            ((0, 0), (1, 0), (2, 0)),  # 180 degree angle
+            ((0, 0), (1, 1), (2, 1)),  # 135 degree angle
+            ((0, 0), (1, 0), (1, 1)),  # 90 degree angle
+            ((0, 0), (1, 0), (0.5, 0.5)),  # 45 degree angle
+            ((0, 0), (1, 100), (2, 0)),  # Sharp spike
+        ],
+    )
+    @pytest.mark.parametrize(
+        "angle_threshold", [-10, 0, 1, 30, 60, 100, 150, 180, 200]
+    )
+    def test_matches_angle_comparison(self, a, b, c, angle_threshold):
+        angle = RemoveSpikes._calculate_angle(a, b, c)
+        cos_threshold = RemoveSpikes._cos_threshold(angle_threshold)
+        assert RemoveSpikes._is_spike_cos(a, b, c, cos_threshold, 0.0) == (
+            angle < angle_threshold
+        )
+
+
 class TestIsSpike:
     @pytest.mark.parametrize(
         "prev_pt, curr_pt, next_pt, angle_threshold, min_distance, expected",
@@ -89,6 +125,116 @@ class TestIsSpike:
         )
 
 
+class TestSpikeMask:
+    @pytest.fixture(autouse=True, params=["numba", "numpy"])
+    def kernel(self, request, monkeypatch):
+        if request.param == "numba" and _kernels.spike_mask is None:
+            pytest.skip("numba is not installed")
+        if request.param == "numpy":
+            monkeypatch.setattr(_kernels, "spike_mask", None)
+
+    @pytest.fixture
+    def coords(self) -> np.ndarray:
+        rng = np.random.default_rng(42)
+        coords = rng.uniform(-10, 10, (200, 2))
+        coords[50] = coords[49]  # Duplicate points
+        return coords
+
+    @pytest.mark.parametrize("angle_threshold", [0, 10, 45, 90, 180, 200])
+    @pytest.mark.parametrize("min_distance", [-1, 0, 5])
+    def test_open_line_matches_is_spike(
+        self, coords, angle_threshold, min_distance
+    ):
+        keep = RemoveSpikes._spike_mask(
+            coords,
+            RemoveSpikes._cos_threshold(angle_threshold),
+            max(min_distance, 0.0) ** 2,
+            closed=False,
+        )
+        expected = [True] + [
+            not RemoveSpikes._is_spike(
+                coords[i - 1],
+                coords[i],
+                coords[i + 1],
+                angle_threshold,
+                min_distance,
+            )
+            for i in range(1, len(coords) - 1)
+        ]
+        assert keep.tolist() == expected + [True]
+
+    @pytest.mark.parametrize("angle_threshold", [0, 10, 45, 90, 180, 200])
+    @pytest.mark.parametrize("min_distance", [-1, 0, 5])
+    def test_closed_ring_matches_is_spike(
+        self, coords, angle_threshold, min_distance
+    ):
+        keep = RemoveSpikes._spike_mask(
+            np.vstack([coords, coords[:1]]),
+            RemoveSpikes._cos_threshold(angle_threshold),
+            max(min_distance, 0.0) ** 2,
+            closed=True,
+        )
+        n = len(coords)
+        expected = [
+            not RemoveSpikes._is_spike(
+                coords[i - 1],
+                coords[i],
+                coords[(i + 1) % n],
+                angle_threshold,
+                min_distance,
+            )
+            for i in range(n)
+        ]
+        assert keep.tolist() == expected + [False]
+
+    @pytest.mark.parametrize("closed", [False, True])
+    def test_multiple_parts_match_single_parts(self, coords, closed):
+        cos_threshold = RemoveSpikes._cos_threshold(60)
+        parts = [coords[:3], coords[3:10], coords[10:100], coords[100:]]
+        if closed:
+            parts = [np.vstack([part, part[:1]]) for part in parts]
+
+        offsets = np.cumsum([0] + [len(part) for part in parts])
+        keep = RemoveSpikes._spike_mask(
+            np.vstack(parts), cos_threshold, 1.0, closed, offsets
+        )
+        expected = np.concatenate(
+            [
+                RemoveSpikes._spike_mask(part, cos_threshold, 1.0, closed)
+                for part in parts
+            ]
+        )
+        assert keep.tolist() == expected.tolist()
+
+
+class TestImport:
+    def test_import_under_both_module_names(self, tmp_path):
+        # The tests import the package as src.removespikes, while the CLI
+        # imports it as removespikes. Each process must work regardless of
+        # the name used by the previous ones, without the other name being
+        # importable.
+        root = Path(__file__).parent.parent
+        code = (
+            "from shapely.geometry import LineString\n"
+            "from {}removespikes import RemoveSpikes\n"
+            "line = LineString([(0, 0), (1, 100), (2, 0), (3, 0)])\n"
+            "result = RemoveSpikes._remove_spikes_from_geometry(line, 5)\n"
+            "assert result.equals(LineString([(0, 0), (2, 0), (3, 0)]))\n"
+        )
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", code.format("")],
+                cwd=tmp_path,
+                env={**os.environ, "PYTHONPATH": str(root / "src")},
+                check=True,
+            )
+            subprocess.run(
+                [sys.executable, "-c", code.format("src.")],
+                cwd=root,
+                check=True,
+            )
+
+
 class TestRemoveSpikesFromGeometry:
     def test_remove_spikes_from_linestring_no_spikes(self):
         linestring = LineString([(0, 0), (1, 1), (2, 2)])
@@ -126,6 +272,20 @@ class TestRemoveSpikesFromGeometry:
             expected
         ), "Expected spike to be removed from Polygon"
 
+    @pytest.mark.parametrize("z", [(), (1,)])
+    def test_remove_spikes_from_linear_ring(self, z):
+        ring = LinearRing(
+            [(0, 0) + z, (1, 100) + z, (2, 0) + z, (3, -1) + z, (4, 0) + z]
+        )
+        expected = LinearRing(
+            [(0, 0) + z, (2, 0) + z, (3, -1) + z, (4, 0) + z]
+        )
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            ring, angle_threshold=5
+        )
+        assert isinstance(result, LinearRing)
+        assert result.equals_exact(expected, 0)
+
     def test_remove_spikes_with_high_angle_threshold(self):
         linestring = LineString([(0, 0), (1, 0), (2, 0)])
         result = RemoveSpikes._remove_spikes_from_geometry(
@@ -213,6 +373,131 @@ class TestRemoveSpikesFromGeometry:
             expected
         ), "Expected polygon to have only spikes with min distance removed"
 
+    def test_remove_spikes_keeps_triangle(self):
+        polygon = Polygon([(0, 0), (1, 100), (2, 0), (0, 0)])
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            polygon, angle_threshold=5
+        )
+        assert result.equals(
+            polygon
+        ), "Expected no change for a triangle, even with a spike"
+
+    def test_remove_spikes_keeps_degenerate_result(self):
+        polygon = Polygon([(0, 0), (1, 100), (2, 0), (1, -100), (0, 0)])
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            polygon, angle_threshold=5
+        )
+        assert result.equals(
+            polygon
+        ), "Expected no change when removing spikes leaves an invalid ring"
+
+    def test_remove_spikes_from_polygon_hole(self):
+        shell = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+        hole = [(2, 2), (4, 2), (5, 8), (6, 2), (8, 2), (8, 1), (2, 1), (2, 2)]
+        polygon = Polygon(shell, [hole])
+        expected = Polygon(
+            shell, [[(2, 2), (4, 2), (6, 2), (8, 2), (8, 1), (2, 1), (2, 2)]]
+        )
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            polygon, angle_threshold=20
+        )
+        assert result.equals(
+            expected
+        ), "Expected spike to be removed from Polygon hole"
+
+    def test_remove_spikes_from_multilinestring(self):
+        multilinestring = MultiLineString(
+            [[(0, 0), (1, 100), (2, 0)], [(0, 0), (1, 1), (2, 2)]]
+        )
+        expected = MultiLineString(
+            [[(0, 0), (2, 0)], [(0, 0), (1, 1), (2, 2)]]
+        )
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            multilinestring, angle_threshold=5
+        )
+        assert result.equals(
+            expected
+        ), "Expected spike to be removed from MultiLineString"
+
+    def test_remove_spikes_from_multipolygon(self):
+        multipolygon = MultiPolygon(
+            [
+                Polygon([(0, 0), (1, 1), (2, 100), (3, 1), (4, 0), (2, -2)]),
+                Polygon([(10, 0), (11, 1), (12, 0), (11, -1)]),
+            ]
+        )
+        expected = MultiPolygon(
+            [
+                Polygon([(0, 0), (1, 1), (3, 1), (4, 0), (2, -2)]),
+                Polygon([(10, 0), (11, 1), (12, 0), (11, -1)]),
+            ]
+        )
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            multipolygon, angle_threshold=5
+        )
+        assert result.equals(
+            expected
+        ), "Expected spike to be removed from MultiPolygon"
+
+    def test_remove_spikes_from_geometry_collection(self):
+        collection = GeometryCollection(
+            [
+                Point(0, 0),
+                LineString([(0, 0), (1, 100), (2, 0)]),
+                GeometryCollection([LineString([(0, 0), (1, 100), (2, 0)])]),
+            ]
+        )
+        expected = GeometryCollection(
+            [
+                Point(0, 0),
+                LineString([(0, 0), (2, 0)]),
+                GeometryCollection([LineString([(0, 0), (2, 0)])]),
+            ]
+        )
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            collection, angle_threshold=5
+        )
+        assert result.equals_exact(
+            expected, 0
+        ), "Expected spikes to be removed from GeometryCollection"
+
+    @pytest.mark.parametrize(
+        "geometry",
+        [
+            LineString([(0, 0), (1, 1), (2, 2)]),
+            Polygon([(0, 0), (1, 1), (2, 0), (1, -1), (0, 0)]),
+            MultiPolygon([Polygon([(0, 0), (1, 1), (2, 0), (1, -1)])]),
+        ],
+    )
+    def test_remove_spikes_returns_unchanged_geometry(self, geometry):
+        result = RemoveSpikes._remove_spikes_from_geometry(geometry)
+        assert result is geometry
+
+    def test_remove_spikes_skips_geometry_smaller_than_min_distance(self):
+        linestring = LineString([(0, 0), (1, 100), (2, 0)])
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            linestring, angle_threshold=5, min_distance=101
+        )
+        assert result is linestring
+
+    @pytest.mark.parametrize(
+        "geometry",
+        [None, Point(0, 0), MultiPoint([(0, 0), (1, 1)]), LineString()],
+    )
+    def test_remove_spikes_ignores_other_geometries(self, geometry):
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            geometry, angle_threshold=5
+        )
+        assert result is geometry
+
+    @pytest.mark.parametrize("angle_threshold", [0, -1])
+    def test_remove_spikes_with_non_positive_angle(self, angle_threshold):
+        linestring = LineString([(0, 0), (1, 100), (2, 0)])
+        result = RemoveSpikes._remove_spikes_from_geometry(
+            linestring, angle_threshold=angle_threshold
+        )
+        assert result is linestring
+
 
 class TestRemoveSpikesFromGeoDataFrame:
     @pytest.fixture
@@ -265,6 +550,12 @@ class TestRemoveSpikesFromGeoDataFrame:
         assert not result_gdf.empty
         assert len(result_gdf) == len(simple_gdf)
 
+    @pytest.mark.parametrize("angle", [0, -1])
+    def test_non_positive_angle(self, simple_gdf, angle):
+        result_gdf = RemoveSpikes.from_geodataframe(simple_gdf, angle=angle)
+        assert result_gdf is not simple_gdf
+        assert result_gdf.equals(simple_gdf)
+
     def test_min_distance(self, simple_gdf):
         result_gdf = RemoveSpikes.from_geodataframe(
             simple_gdf, min_distance=0.5
@@ -272,6 +563,58 @@ class TestRemoveSpikesFromGeoDataFrame:
         assert not result_gdf.empty
         assert len(result_gdf) == len(simple_gdf)
 
+    @pytest.mark.parametrize("copy", [True, False])
+    def test_input_not_modified(self, copy):
+        gdf = gpd.GeoDataFrame(
+            {
+                "name": ["spike"],
+                "geometry": [LineString([(0, 0), (1, 100), (2, 0)])],
+            }
+        )
+        original = gdf.copy()
+        result_gdf = RemoveSpikes.from_geodataframe(gdf, angle=5, copy=copy)
+        assert result_gdf is not gdf
+        assert result_gdf.geometry.iloc[0].equals(LineString([(0, 0), (2, 0)]))
+        assert gdf.equals(original)
+
+    def test_keeps_crs(self, simple_gdf):
+        simple_gdf = simple_gdf.set_crs("EPSG:4326")
+        result_gdf = RemoveSpikes.from_geodataframe(simple_gdf)
+        assert result_gdf.crs == simple_gdf.crs
+
+    def test_mixed_dimensions(self):
+        gdf = gpd.GeoDataFrame(
+            {
+                "geometry": [
+                    LineString([(0, 0, 1), (1, 100, 2), (2, 0, 3)]),
+                    LineString([(0, 0), (1, 100), (2, 0)]),
+                ]
+            }
+        )
+        result_gdf = RemoveSpikes.from_geodataframe(gdf, angle=5)
+        assert result_gdf.geometry.iloc[0].equals_exact(
+            LineString([(0, 0, 1), (2, 0, 3)]), 0
+        )
+        assert not result_gdf.geometry.iloc[1].has_z
+
+    @pytest.mark.parametrize("n_jobs", [2, 3, -1])
+    def test_n_jobs(self, n_jobs):
+        spiky_gdf = gpd.GeoDataFrame(
+            {
+                "geometry": [
+                    LineString([(0, 0), (1, 100), (2, 0)]),
+                    Polygon([(0, 0), (1, 1), (2, 100), (3, 1), (4, 0)]),
+                ]
+                * 5
+            }
+        )
+        expected = RemoveSpikes.from_geodataframe(spiky_gdf, angle=5)
+        result_gdf = RemoveSpikes.from_geodataframe(
+            spiky_gdf, angle=5, n_jobs=n_jobs
+        )
+        assert result_gdf.index.equals(spiky_gdf.index)
+        assert result_gdf.geometry.geom_equals(expected.geometry).all()
+
 
 class TestRemoveSpikesFromFile:
     @pytest.fixture
@@ -319,7 +662,7 @@ class TestRemoveSpikesFromFile:
         assert len(result) == 2
 
     def test_from_file_invalid_file(self):
-        with pytest.raises(fiona.errors.DriverError):
+        with pytest.raises(pyogrio.errors.DataSourceError):
             RemoveSpikes.from_file("invalid_file.gpkg")
 
     def test_from_file_empty_gdf(self, temp_file):
@@ -334,6 +677,26 @@ class TestRemoveSpikesFromFile:
         assert isinstance(result, gpd.GeoDataFrame)
         assert result.empty
 
+    @pytest.mark.parametrize("has_pyarrow", [True, False])
+    def test_from_file_uses_arrow_if_available(
+        self, monkeypatch, sample_gdf, has_pyarrow
+    ):
+        monkeypatch.setattr(
+            RemoveSpikes, "_has_pyarrow", staticmethod(lambda: has_pyarrow)
+        )
+        with patch("geopandas.read_file", return_value=sample_gdf) as read:
+            RemoveSpikes.from_file("file.gpkg")
+
+        read.assert_called_once_with(
+            "file.gpkg", engine="pyogrio", use_arrow=has_pyarrow
+        )
+
+    def test_from_file_other_engine(self, sample_gdf):
+        with patch("geopandas.read_file", return_value=sample_gdf) as read:
+            RemoveSpikes.from_file("file.gpkg", engine="fiona")
+
+        read.assert_called_once_with("file.gpkg", engine="fiona")
+
 
 if __name__ == "__main__":
     pytest.main()